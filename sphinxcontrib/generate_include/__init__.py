@@ -1,21 +1,39 @@
+import functools
 import importlib.metadata
 
 from sphinx.application import Sphinx
 from sphinx.util.typing import ExtensionMetadata
 
-from .generate_include import GenerateIncludeDirective
+from .generate_include import GenerateIncludeDirective, merge_environment, prepare_environment
 
-__version__ = importlib.metadata.version(__name__)
+
+@functools.cache
+def _version() -> str:
+    """Get the version of the package from its metadata, looked up once on first use."""
+    return importlib.metadata.version(__name__)
+
+
+def __getattr__(name: str) -> str:
+    """Provide ``__version__`` lazily, the metadata lookup searches ``sys.path``."""
+    if name == "__version__":
+        return _version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def setup(app: Sphinx) -> ExtensionMetadata:
     """Set up the Sphinx extension."""
     app.require_sphinx("7.0")
 
+    app.add_config_value("generate_include_cache_results", False, "env", types=[bool])
+    app.add_config_value("generate_include_persistent_cache", False, "env", types=[bool])
+
     app.add_directive("generate-include", GenerateIncludeDirective)
+    app.connect("env-before-read-docs", prepare_environment)
+    app.connect("env-merge-info", merge_environment)
 
     return {
-        "version": __version__,
+        "version": _version(),
+        "env_version": 2,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
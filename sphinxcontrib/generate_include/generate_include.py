@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-import importlib.machinery
-import importlib.util
+import ast
+import contextlib
+import copy
+import functools
+import hashlib
+import importlib
 import itertools
+import os
 import sys
 import traceback
+from collections import OrderedDict
 from pathlib import Path
-from typing import ClassVar
+from types import CodeType, ModuleType
+from typing import TYPE_CHECKING, ClassVar
 
 from docutils import nodes
-from docutils.frontend import OptionParser
+from docutils.frontend import OptionParser, Values
 from docutils.parsers.rst import directives
 from docutils.statemachine import StringList
 from docutils.utils import new_document
@@ -17,22 +24,140 @@ from myst_parser.parsers.docutils_ import Parser as MystParser
 from sphinx.util.docutils import SphinxDirective
 from sphinx.util.typing import OptionSpec
 
-# Counter to ensure unique module names across all invocations
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sphinx.application import Sphinx
+    from sphinx.environment import BuildEnvironment
+
+# Counter to ensure unique module names across all compiled files
 _module_counter = itertools.count()
 
+# Maximum number of outputs kept in the result cache
+_RESULT_CACHE_SIZE = 1024
+
+# Directory below the doctree directory holding persistently cached outputs
+_PERSISTENT_CACHE_DIR = "generate_include_cache"
+
+# Comment opting a generator file out of the persistent cache
+_NO_CACHE_MARKER = b"# generate-include: no-cache"
+
+# Sentinel for attributes missing from a generator module
+_MISSING = object()
+
+# MyST parser shared by all directives, it holds no state between parses
+_MYST_PARSER = MystParser()
 
-class _NoCacheSourceFileLoader(importlib.machinery.SourceFileLoader):
-    """A SourceFileLoader that always reads from source, never from bytecode cache.
 
-    This is essential for sphinx-autobuild scenarios where the Python process
-    stays running and source files may change between builds.
+@functools.cache
+def _myst_default_settings() -> Values:
+    """Get the default docutils settings for the MyST parser, computed once."""
+    return OptionParser(components=(MystParser,)).get_default_values()
+
+
+@functools.cache
+def _persistent_cache_salt() -> bytes:
+    """Get the part of the persistent cache keys identifying the Python and package version.
+
+    Outputs may depend on either of them, e.g. through ``repr`` or the ``mdlib`` formatting,
+    so outputs stored by other versions are not reused.
     """
+    from . import __version__  # noqa: PLC0415 - the package imports this module
+
+    return f"{sys.version_info.major}.{sys.version_info.minor}:{__version__}".encode()
+
 
-    def get_code(self, fullname: str):
-        """Compile code directly from source, bypassing any bytecode cache."""
-        source_path = self.get_filename(fullname)
-        source_bytes = self.get_data(source_path)
-        return compile(source_bytes, source_path, "exec", dont_inherit=True)
+@contextlib.contextmanager
+def _module_importable(module: ModuleType, file_dir: str) -> Iterator[None]:
+    """Register a module in ``sys.modules`` and its directory on ``sys.path`` temporarily.
+
+    The module must be registered while it is executed and its functions are called,
+    ``typing.get_type_hints``, dataclasses and pickle look up the globals of objects
+    through ``sys.modules``. The directory is only added to ``sys.path`` if it is not
+    on it already, it allows imports of other modules next to the file.
+
+    :param module: Module being executed
+    :param file_dir: Directory of the file of the module
+    """
+    inserted_path = file_dir not in sys.path
+    if inserted_path:
+        sys.path.insert(0, file_dir)
+    sys.modules[module.__name__] = module
+    try:
+        yield
+    finally:
+        sys.modules.pop(module.__name__, None)
+        if inserted_path:
+            with contextlib.suppress(ValueError):
+                sys.path.remove(file_dir)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_cached(path: str, mtime_ns: int, size: int) -> tuple[CodeType, str, dict[str, str]]:
+    """Compile a Python file and create the name of the module to execute it in.
+
+    The code is always compiled from source, never read from a bytecode cache on
+    disk. Passing the modification time and size of the file as part of the cache
+    key reuses the code of unchanged files and recompiles changed ones. The module
+    name is unique per compiled version of the file.
+
+    :param path: Path of the Python file
+    :param mtime_ns: Modification time of the file in nanoseconds
+    :param size: Size of the file in bytes
+    :return: Compiled code, module name and outputs of functions returning a constant
+    """
+    # The file is new or has changed, it may import modules that were created since the
+    # import system last scanned their directory
+    importlib.invalidate_caches()
+
+    tree = ast.parse(Path(path).read_bytes(), path)
+    code = compile(tree, path, "exec", dont_inherit=True)
+    module_name = f"_generate_include_{Path(path).stem}_{next(_module_counter)}"
+    return code, module_name, _constant_outputs(tree)
+
+
+def _constant_outputs(tree: ast.Module) -> dict[str, str]:
+    """Get the outputs of the functions of a module that only return a constant.
+
+    Outputs are only determined if executing the module has no effect besides defining
+    its functions, i.e. it contains nothing but a docstring and functions without
+    decorators, parameters or annotations. Such functions do not need to be executed.
+
+    :param tree: Syntax tree of the module
+    :return: Mapping of function names to their outputs
+    """
+    body = tree.body
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+        body = body[1:]
+
+    outputs: dict[str, str] = {}
+    for node in body:
+        if (
+            not isinstance(node, ast.FunctionDef)
+            or node.decorator_list
+            or node.returns
+            or node.type_params
+            or _has_parameters(node.args)
+        ):
+            return {}
+        outputs.pop(node.name, None)
+
+        func_body = node.body
+        if (
+            len(func_body) == 2  # noqa: PLR2004 - docstring and return statement
+            and isinstance(func_body[0], ast.Expr)
+            and isinstance(func_body[0].value, ast.Constant)
+        ):
+            func_body = func_body[1:]
+        match func_body:
+            case [ast.Return(value=ast.Constant(value=value))]:
+                outputs[node.name] = "" if value is None else str(value)
+    return outputs
+
+
+def _has_parameters(args: ast.arguments) -> bool:
+    """Check whether a function definition has any parameters."""
+    return bool(args.posonlyargs or args.args or args.vararg or args.kwonlyargs or args.kwarg)
 
 
 class GenerateIncludeDirective(SphinxDirective):
@@ -62,33 +187,30 @@ class GenerateIncludeDirective(SphinxDirective):
         # Get the output type (default: md)
         output_type = self.options.get("type", "md")
 
-        # Resolve the file path relative to the source file
-        source_dir = Path(self.env.srcdir)
-        doc_dir = Path(self.env.doc2path(self.env.docname)).parent
+        # Resolve the file path relative to the source file, using plain strings
+        # for the lookup and creating the Path only for the resolved file
+        doc_dir = os.path.dirname(self.env.doc2path(self.env.docname))
 
-        # Try relative to the current document first, then relative to source dir
-        file_path = doc_dir / file_path_str
-        if not file_path.exists():
-            file_path = source_dir / file_path_str
+        # Try relative to the current document first, then relative to source dir.
+        # A single stat per candidate checks for existence and provides the mtime.
+        resolved_path = os.path.join(doc_dir, file_path_str)
+        try:
+            file_stat = os.stat(resolved_path)
+        except OSError:
+            resolved_path = os.path.join(self.env.srcdir, file_path_str)
+            try:
+                file_stat = os.stat(resolved_path)
+            except OSError:
+                return self._error(f"File not found: {file_path_str}")
 
-        if not file_path.exists():
-            return self._error(f"File not found: {file_path_str}")
+        file_path = Path(resolved_path)
 
         # Add the file as a dependency so Sphinx rebuilds when it changes
         self.env.note_dependency(str(file_path))
 
-        # Check if the Python file has been modified since last build
-        # and mark the current document for re-reading if needed
-        file_mtime = file_path.stat().st_mtime
-        dep_key = f"_generate_include_mtime_{file_path}"
-        stored_mtime = getattr(self.env, dep_key, None)
-
-        if stored_mtime != file_mtime:
-            setattr(self.env, dep_key, file_mtime)
-
         # Execute the function and get the output
         try:
-            output = self._execute_function(file_path, function_name)
+            output = self._execute_function_cached(file_path, function_name, file_stat)
         except Exception as exc:
             return self._error(f"Error executing {argument}: {exc} \n{traceback.format_exc()}")
 
@@ -103,41 +225,32 @@ class GenerateIncludeDirective(SphinxDirective):
     def _execute_function(self, file_path: Path, function_name: str) -> str:
         """Load a Python file and execute the specified function.
 
-        Uses importlib with a custom loader that bypasses bytecode caching
-        to ensure fresh code is loaded on each execution. This is critical
-        for sphinx-autobuild scenarios where files change while the Python
-        process is running.
+        The code is executed in a fresh module on each call, so changes to the
+        file and to module globals never leak between executions. This is
+        critical for sphinx-autobuild scenarios where files change while the
+        Python process is running.
         """
+        st = os.stat(file_path)
+        code, module_name, constant_outputs = _compile_cached(
+            str(file_path), st.st_mtime_ns, st.st_size
+        )
+        # Functions only returning a constant in a module only defining functions have
+        # the same output without executing anything
+        output = constant_outputs.get(function_name)
+        if output is not None:
+            return output
 
-        # Create a unique module name using a monotonic counter to ensure fresh load
-        module_name = f"_generate_include_{file_path.stem}_{next(_module_counter)}"
-
-        # Create a loader that bypasses bytecode caching
-        loader = _NoCacheSourceFileLoader(module_name, str(file_path))
-        spec = importlib.util.spec_from_loader(module_name, loader)
-        if spec is None or spec.loader is None:
-            raise ImportError(f"Cannot create module spec for {file_path}")
-
-        module = importlib.util.module_from_spec(spec)
-
-        # Add the file's directory to sys.path temporarily for relative imports
-        file_dir = str(file_path.parent)
-        original_path = sys.path.copy()
-        if file_dir not in sys.path:
-            sys.path.insert(0, file_dir)
-
-        try:
-            # Add module to sys.modules before loading for relative imports
-            sys.modules[module_name] = module
+        module = ModuleType(module_name)
+        module.__file__ = str(file_path)
 
-            # Execute the module using the loader
-            spec.loader.exec_module(module)
+        with _module_importable(module, str(file_path.parent)):
+            # Execute the module code in the namespace of the module
+            exec(code, module.__dict__)
 
             # Get and call the function
-            if not hasattr(module, function_name):
+            func = getattr(module, function_name, _MISSING)
+            if func is _MISSING:
                 raise AttributeError(f"Function '{function_name}' not found in {file_path}")
-
-            func = getattr(module, function_name)
             if not callable(func):
                 raise TypeError(f"'{function_name}' is not callable")
 
@@ -148,16 +261,79 @@ class GenerateIncludeDirective(SphinxDirective):
                 return ""
             return str(result)
 
-        finally:
-            # Restore the original sys.path
-            sys.path[:] = original_path
-            if module_name in sys.modules:
-                del sys.modules[module_name]
+    def _execute_function_cached(
+        self, file_path: Path, function_name: str, file_stat: os.stat_result
+    ) -> str:
+        """Execute the specified function, reusing the output of a previous execution.
+
+        Depending on the configuration, outputs are reused from the build environment,
+        across directives and incremental builds, and from a cache directory next to the
+        doctrees, across builds with a fresh environment, as long as the file contents are
+        unchanged. Files opting out of caching are always executed.
+        """
+        if self.config.generate_include_persistent_cache:
+            execute = self._execute_function_persistent
+        else:
+            execute = self._execute_function
+        if not self.config.generate_include_cache_results:
+            return execute(file_path, function_name)
+
+        # Identify the contents of the Python file by their hash, which is only
+        # recomputed when the modification time or size of the file changed
+        sources = self.env.generate_include_sources  # pyrefly: ignore[missing-attribute]
+        digest = _source_digest(sources, str(file_path), file_stat)
+        if digest is None:
+            return execute(file_path, function_name)
+
+        results = self.env.generate_include_results  # pyrefly: ignore[missing-attribute]
+        key = (str(file_path), digest, function_name)
+        if key in results:
+            results.move_to_end(key)
+            return results[key]
+
+        # Failed executions raise here and are never cached
+        output = execute(file_path, function_name)
+        results[key] = output
+        _trim_results(results)
+        return output
+
+    def _execute_function_persistent(self, file_path: Path, function_name: str) -> str:
+        """Execute the specified function, reusing its output stored on disk by a previous build.
+
+        Outputs are stored per hash of the file contents, the function name and the Python
+        and package versions. Files containing a ``# generate-include: no-cache`` comment are
+        always executed.
+        """
+        source = file_path.read_bytes()
+        if _NO_CACHE_MARKER in source:
+            return self._execute_function(file_path, function_name)
+
+        # Python source cannot contain null bytes, so they safely separate the key parts
+        key = b"\0".join((source, function_name.encode(), _persistent_cache_salt()))
+        digest = hashlib.sha256(key).hexdigest()
+        cache_file = Path(self.env.doctreedir, _PERSISTENT_CACHE_DIR, f"{digest}.txt")
+        try:
+            return cache_file.read_bytes().decode()
+        except FileNotFoundError:
+            pass
+
+        output = self._execute_function(file_path, function_name)
+
+        # Write to a temporary file first, parallel readers may look up the same output
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_bytes(output.encode())
+        os.replace(tmp_file, cache_file)
+        return output
 
     def _parse_rst(self, content: str) -> list[nodes.Node]:
         """Parse content as reStructuredText."""
+        # Empty output needs no parsing
+        if not content or content.isspace():
+            return []
+
         # Create a StringList from the content
-        lines = content.split("\n")
+        lines = content.splitlines()
         string_list = StringList(lines, source=self.env.docname)
 
         # Create a container node
@@ -171,18 +347,19 @@ class GenerateIncludeDirective(SphinxDirective):
 
     def _parse_markdown(self, content: str) -> list[nodes.Node]:
         """Parse content as Markdown using MyST parser."""
+        # Empty output needs no parsing
+        if not content or content.isspace():
+            return []
 
-        # Create a new document for parsing
-        parser = MystParser()
-        option_parser = OptionParser(components=(MystParser,))
-        settings = option_parser.get_default_values()
+        # Create a new document for parsing, on a copy of the shared default settings
+        settings = copy.copy(_myst_default_settings())
 
         # Copy relevant settings from the current document
         settings.env = self.env
         settings.myst_enable_extensions = getattr(self.config, "myst_enable_extensions", [])
 
         doc = new_document("<generate-include>", settings=settings)
-        parser.parse(content, doc)
+        _MYST_PARSER.parse(content, doc)
 
         # Return all children except the document node itself
         return list(doc.children)
@@ -208,3 +385,67 @@ class GenerateIncludeDirective(SphinxDirective):
             message,
             line=self.lineno,
         )
+
+
+def _source_digest(
+    sources: dict[str, tuple[int, int, str | None]], path: str, st: os.stat_result
+) -> str | None:
+    """Get the hash of the contents of a file.
+
+    :param sources: Mapping of paths to the modification time in nanoseconds, size and hash of
+                    their files, updated if the file was modified
+    :param path: Path of the file
+    :param st: Current status of the file
+    :return: Hash of the file contents, ``None`` if the file opts out of caching
+    """
+    stored = sources.get(path)
+    if stored is not None and stored[:2] == (st.st_mtime_ns, st.st_size):
+        return stored[2]
+
+    # The file is read at once, it is searched for the opt-out marker as well
+    with open(path, "rb") as f:
+        source = f.read()
+    digest = None
+    if _NO_CACHE_MARKER not in source:
+        digest = hashlib.blake2b(source, digest_size=16).hexdigest()
+    sources[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def _trim_results(results: OrderedDict[tuple[str, str, str], str]) -> None:
+    """Drop the least recently used outputs exceeding the size of the result cache."""
+    while len(results) > _RESULT_CACHE_SIZE:
+        results.popitem(last=False)
+
+
+def prepare_environment(app: Sphinx, env: BuildEnvironment, docnames: list[str]) -> None:
+    """Create the generate-include data on the environment and drop outputs of changed files."""
+    sources: dict[str, tuple[int, int, str | None]] = env.__dict__.setdefault(
+        "generate_include_sources", {}
+    )
+    results: OrderedDict[tuple[str, str, str], str] = env.__dict__.setdefault(
+        "generate_include_results", OrderedDict()
+    )
+    current_digests: dict[str, str | None] = {}
+    for key in list(results):
+        path, digest, _ = key
+        if path not in current_digests:
+            try:
+                current_digests[path] = _source_digest(sources, path, os.stat(path))
+            except OSError:
+                current_digests[path] = None
+        if current_digests[path] != digest:
+            del results[key]
+
+
+def merge_environment(
+    app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment
+) -> None:
+    """Merge the data collected by a parallel reader process into the main environment."""
+    env.generate_include_sources.update(  # pyrefly: ignore[missing-attribute]
+        other.generate_include_sources  # pyrefly: ignore[missing-attribute]
+    )
+    env.generate_include_results.update(  # pyrefly: ignore[missing-attribute]
+        other.generate_include_results  # pyrefly: ignore[missing-attribute]
+    )
+    _trim_results(env.generate_include_results)  # pyrefly: ignore[missing-attribute]
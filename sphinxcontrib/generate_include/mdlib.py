@@ -1,21 +1,13 @@
 import collections.abc
-from typing import Literal, cast
-
-import jinja2
-
-MDTABLE_TEMPLATE = jinja2.Template("""
-| {{ headers | join(" | ")}} |
-| {{ header_aligns | join(" | ")}} |
-{%- for row in rows %}
-| {{ row | join(" | ")}} |
-{%- endfor %}
-
-""")
-
+import functools
+from typing import Literal
 
 type Alignment = Literal["l", "r", "c"]
 Row = collections.abc.Sequence[str]
 
+# Colons at the start and end of the alignment specifier of a column
+_ALIGNMENT_MARKERS: dict[str, tuple[str, str]] = {"l": (":", ""), "r": ("", ":"), "c": (":", ":")}
+
 
 def _table_column_alignment_specifier(align: Alignment, header: str) -> str:
     """Create the alignment specifier for a column in a markdown table.
@@ -25,14 +17,11 @@ def _table_column_alignment_specifier(align: Alignment, header: str) -> str:
     :raises ValueError: If an invalid alignment specifier is provided
     :return: Alignment line for the markdown table
     """
-    if align == "l":
-        return ":" + "-" * max(len(header) - 1, 1)
-    elif align == "r":
-        return "-" * max(len(header) - 1, 1) + ":"
-    elif align == "c":
-        return ":" + "-" * max(len(header) - 2, 1) + ":"
-    else:
-        raise ValueError(f"Invalid alignment specifier: {align}")
+    try:
+        start, end = _ALIGNMENT_MARKERS[align]
+    except KeyError:
+        raise ValueError(f"Invalid alignment specifier: {align}") from None
+    return start + "-" * max(len(header) - len(start) - len(end), 1) + end
 
 
 def table(
@@ -50,19 +39,34 @@ def table(
                       (left alignment).
     :return: The rendered Markdown table as a string.
     """
-    alignment_line: list[str] = []
-    alignment_per_header: list[Alignment] = (
-        cast(list[Alignment], [alignment] * len(headers))
-        if isinstance(alignment, str)
-        else list(alignment)
+    head = _table_head(
+        tuple(headers), alignment if isinstance(alignment, str) else tuple(alignment)
     )
+    lines = [head]
+    lines.extend("| " + " | ".join(map(str, row)) + " |" for row in rows)
+    lines.append("")
+    return "\n".join(lines)
 
-    alignment_line = [
-        _table_column_alignment_specifier(cast(Alignment, col_align), header)
-        for header, col_align in zip(headers, alignment_per_header, strict=True)
-    ]
 
-    return MDTABLE_TEMPLATE.render(headers=headers, rows=rows, header_aligns=alignment_line)
+@functools.lru_cache(maxsize=128)
+def _table_head(headers: tuple[str, ...], alignment: Alignment | tuple[Alignment, ...]) -> str:
+    """Create the header and alignment rows of a Markdown table.
+
+    The result is cached, so tables of the same shape rendered repeatedly only build it once.
+
+    :param headers: Header texts
+    :param alignment: Alignment for all columns or per column
+    :return: Header and alignment rows, preceded by a newline
+    """
+    if isinstance(alignment, str):
+        alignment_line = [_table_column_alignment_specifier(alignment, h) for h in headers]
+    else:
+        alignment_line = [
+            _table_column_alignment_specifier(col_align, h)
+            for h, col_align in zip(headers, alignment, strict=True)
+        ]
+
+    return "\n| " + " | ".join(headers) + " |\n| " + " | ".join(alignment_line) + " |"
 
 
 def header(text: str, level: int = 1) -> str:
@@ -79,26 +83,31 @@ def header(text: str, level: int = 1) -> str:
 type NestedList[T] = T | list[NestedList[T]]
 
 
-def _mdlist(
-    items: NestedList[str],
-    ordered: bool,
-    level: int = 0,
-) -> list[str]:
-    """Create a Markdown list.
+def _mdlist(items: NestedList[str], ordered: bool) -> list[str]:
+    """Create the lines of a Markdown list.
+
+    Nested lists are walked with an explicit stack of iterators instead of recursion, each
+    holding the indented prefix of the items of its level.
 
     :param items: List of items (strings or nested lists)
-    :param ordered: Whether the list is ordered, defaults to False
-    :return: Markdown list string
+    :param ordered: Whether the list is ordered
+    :return: Lines of the Markdown list
     """
-    md_list = []
     prefix = "1. " if ordered else "- "
-    indent = " " * (level * len(prefix))
-
-    for item in items:
+    step = " " * len(prefix)
+    md_list: list[str] = []
+    stack = [(iter(items), prefix)]
+    while stack:
+        it, item_prefix = stack[-1]
+        try:
+            item = next(it)
+        except StopIteration:
+            stack.pop()
+            continue
         if isinstance(item, str):
-            md_list.append(f"{indent}{prefix}{item}")
+            md_list.append(item_prefix + item)
         else:
-            md_list.extend(_mdlist(items=item, ordered=ordered, level=level + 1))
+            stack.append((iter(item), step + item_prefix))
     return md_list
 
 
@@ -2,20 +2,28 @@
 
 from __future__ import annotations
 
+import os
 import textwrap
+import uuid
 from pathlib import Path
 
 import pytest
+from sphinx.testing.util import SphinxTestApp
 
 from sphinxcontrib.generate_include.generate_include import GenerateIncludeDirective
 
 
-@pytest.fixture
-def tmp_python_file(tmp_path: Path):
-    """Create a temporary Python file with a generator function."""
+@pytest.fixture(scope="module")
+def tmp_python_file(tmp_path_factory: pytest.TempPathFactory):
+    """Create a temporary Python file with a generator function.
+
+    All files of a test module share one directory, each file gets a unique name.
+    """
+    base_dir = tmp_path_factory.mktemp("generators")
 
     def _create_file(content: str, filename: str = "generator.py") -> Path:
-        file_path = tmp_path / filename
+        stem, suffix = os.path.splitext(filename)
+        file_path = base_dir / f"{stem}_{uuid.uuid4().hex}{suffix}"
         file_path.write_text(textwrap.dedent(content))
         return file_path
 
@@ -23,7 +31,56 @@ def tmp_python_file(tmp_path: Path):
 
 
 @pytest.fixture
+def bump_mtime():
+    """Advance the mtime of a rewritten file past its previous mtime, without sleeping.
+
+    Rewrites within the timestamp resolution of the filesystem would otherwise keep the mtime
+    and not be detected as changes.
+    """
+    last_mtimes: dict[Path, int] = {}
+
+    def _bump_mtime(path: Path) -> None:
+        st = path.stat()
+        mtime_ns = max(st.st_mtime_ns, last_mtimes.get(path, st.st_mtime_ns)) + 1_000_000
+        os.utime(path, ns=(st.st_atime_ns, mtime_ns))
+        last_mtimes[path] = mtime_ns
+
+    return _bump_mtime
+
+
+@pytest.fixture(scope="module")
 def directive():
-    """Create a GenerateIncludeDirective instance for testing _execute_function."""
+    """Create a GenerateIncludeDirective instance for testing _execute_function.
+
+    The instance is shared by the tests of a module, _execute_function keeps no state on it.
+    """
     # Create a minimal instance - _execute_function doesn't use most directive attributes
     return object.__new__(GenerateIncludeDirective)
+
+
+@pytest.fixture
+def make_app(tmp_path: Path):
+    """Create a Sphinx application for a project made up of the given source files."""
+    apps: list[SphinxTestApp] = []
+
+    def _make_app(files: dict[str, str], parallel: int = 0, **confoverrides) -> SphinxTestApp:
+        srcdir = tmp_path / "src"
+        srcdir.mkdir(exist_ok=True)
+        (srcdir / "conf.py").write_text('extensions = ["sphinxcontrib.generate_include"]\n')
+        for filename, content in files.items():
+            (srcdir / filename).parent.mkdir(parents=True, exist_ok=True)
+            (srcdir / filename).write_text(textwrap.dedent(content))
+
+        app = SphinxTestApp(
+            srcdir=srcdir,
+            builddir=tmp_path / "build",
+            confoverrides=confoverrides,
+            parallel=parallel,
+        )
+        apps.append(app)
+        return app
+
+    yield _make_app
+
+    for app in apps:
+        app.cleanup()
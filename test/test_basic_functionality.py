@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import pytest
+from docutils import nodes
 
 
 def test_execute_simple_function(tmp_python_file, directive):
@@ -57,3 +58,50 @@ def test_not_callable(tmp_python_file, directive):
 
     with pytest.raises(TypeError, match="'generate' is not callable"):
         directive._execute_function(file_path, "generate")
+
+
+def test_markdown_output_in_multiple_directives(make_app):
+    """Test that Markdown output is parsed for every directive in a document."""
+    app = make_app(
+        {
+            "index.rst": """
+                .. generate-include:: generator.py:first
+
+                .. generate-include:: generator.py:second
+            """,
+            "generator.py": """
+                def first():
+                    return "- First item"
+
+                def second():
+                    return "**Second**"
+            """,
+        }
+    )
+    app.build()
+
+    doctree = app.env.get_doctree("index")
+    assert doctree.next_node(nodes.bullet_list).astext() == "First item"
+    assert doctree.next_node(nodes.strong).astext() == "Second"
+
+
+def test_file_resolution_relative_to_document_and_source_dir(make_app):
+    """Test that files are looked up next to the document first, then in the source dir."""
+    app = make_app(
+        {
+            "index.rst": ".. toctree::\n\n   sub/page\n",
+            "generator.py": "def generate():\n    return 'From source dir'\n",
+            "sub/page.rst": """
+                .. generate-include:: generator.py:generate
+                   :type: literal
+
+                .. generate-include:: local.py:generate
+                   :type: literal
+            """,
+            "sub/local.py": "def generate():\n    return 'From document dir'\n",
+        }
+    )
+    app.build()
+
+    text = app.env.get_doctree("sub/page").astext()
+    assert text == "From source dir\n\nFrom document dir"
@@ -6,15 +6,23 @@ and needs fresh code on each rebuild.
 
 from __future__ import annotations
 
+import ast
+import hashlib
+import os
 import sys
 import time
 
 import pytest
 
-from sphinxcontrib.generate_include.generate_include import GenerateIncludeDirective
+from sphinxcontrib.generate_include import generate_include
+from sphinxcontrib.generate_include.generate_include import (
+    GenerateIncludeDirective,
+    _compile_cached,
+    _constant_outputs,
+)
 
 
-def test_module_reloading_on_file_change(tmp_python_file):
+def test_module_reloading_on_file_change(tmp_python_file, bump_mtime):
     """Test that changes to the source file are picked up on subsequent calls.
 
     Uses fresh directive instances to simulate separate sphinx build invocations.
@@ -29,12 +37,12 @@ def test_module_reloading_on_file_change(tmp_python_file):
     result1 = directive1._execute_function(file_path, "generate")
     assert result1 == "Version 1"
 
-    # Modify the file (ensure mtime changes)
-    time.sleep(0.01)
+    # Modify the file and ensure its mtime changes
     file_path.write_text("""
 def generate():
     return "Version 2"
 """)
+    bump_mtime(file_path)
 
     # Second call with fresh directive (simulates new sphinx build)
     directive2 = object.__new__(GenerateIncludeDirective)
@@ -135,3 +143,310 @@ def test_global_state_does_not_persist(tmp_python_file, directive):
     # Both should return "Count: 1" because module is reloaded each time
     assert result1 == "Count: 1"
     assert result2 == "Count: 1"
+
+
+def test_compiled_code_reused_for_unchanged_file(tmp_python_file, directive, bump_mtime):
+    """Test that unchanged files are not recompiled, while changed files are."""
+    file_path = tmp_python_file("""
+        def generate():
+            return "test"
+    """)
+
+    misses = _compile_cached.cache_info().misses
+    directive._execute_function(file_path, "generate")
+    directive._execute_function(file_path, "generate")
+    assert _compile_cached.cache_info().misses == misses + 1
+
+    file_path.write_text("""
+def generate():
+    return "changed"
+""")
+    bump_mtime(file_path)
+    assert directive._execute_function(file_path, "generate") == "changed"
+    assert _compile_cached.cache_info().misses == misses + 2
+
+
+def test_rewrite_with_same_size_and_close_mtime(tmp_python_file, directive):
+    """Test that a rewrite keeping the size is picked up if the mtime moved by a nanosecond."""
+    file_path = tmp_python_file("""
+        def generate():
+            return "v1"
+    """)
+    assert directive._execute_function(file_path, "generate") == "v1"
+
+    mtime_ns = file_path.stat().st_mtime_ns
+    file_path.write_text(file_path.read_text().replace("v1", "v2"))
+    os.utime(file_path, ns=(mtime_ns + 1, mtime_ns + 1))
+    assert directive._execute_function(file_path, "generate") == "v2"
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ('def generate():\n    return "text"', {"generate": "text"}),
+        (
+            '"""Docs."""\ndef a():\n    """Docs."""\n    return 1\ndef b():\n    return None',
+            {"a": "1", "b": ""},
+        ),
+        ('def generate():\n    return "a"\ndef generate():\n    return str(1)', {}),
+        ('import os\ndef generate():\n    return "text"', {}),
+        ('@decorator\ndef generate():\n    return "text"', {}),
+        ('def generate(x=print()):\n    return "text"', {}),
+        ('def generate() -> str:\n    return "text"', {}),
+    ],
+    ids=["constant", "docstrings", "redefined", "statement", "decorator", "default", "annotation"],
+)
+def test_constant_outputs(source, expected):
+    """Test that only functions which need not be executed to get their output are detected."""
+    assert _constant_outputs(ast.parse(source)) == expected
+
+
+COUNTING_GENERATOR = """
+    from pathlib import Path
+
+    def generate():
+        calls = Path(__file__).with_suffix(".calls")
+        calls.write_text(calls.read_text() + "x" if calls.exists() else "x")
+        return "Generated output"
+"""
+
+DOUBLE_INCLUDE_RST = """
+    .. generate-include:: generator.py:generate
+       :type: rst
+
+    .. generate-include:: generator.py:generate
+       :type: rst
+"""
+
+
+@pytest.mark.parametrize(("cache_results", "expected_calls"), [(True, "x"), (False, "xx")])
+def test_result_cache(make_app, cache_results, expected_calls):
+    """Test that results are only reused when the result cache is enabled."""
+    app = make_app(
+        {"index.rst": DOUBLE_INCLUDE_RST, "generator.py": COUNTING_GENERATOR},
+        generate_include_cache_results=cache_results,
+    )
+    app.build()
+
+    assert app.env.get_doctree("index").astext() == "Generated output\n\nGenerated output"
+    assert (app.srcdir / "generator.calls").read_text() == expected_calls
+
+
+def test_result_cache_drops_outputs_of_changed_files(make_app):
+    """Test that outputs of changed files are dropped from the result cache."""
+    app = make_app(
+        {"index.rst": DOUBLE_INCLUDE_RST, "generator.py": COUNTING_GENERATOR},
+        generate_include_cache_results=True,
+    )
+    app.build()
+    assert len(app.env.generate_include_results) == 1
+
+    time.sleep(0.01)
+    (app.srcdir / "generator.py").write_text('def generate():\n    return "Changed output"\n')
+    app.build()
+
+    assert list(app.env.generate_include_results.values()) == ["Changed output"]
+    assert "Changed output" in app.env.get_doctree("index").astext()
+
+
+def test_result_cache_drops_outputs_of_resized_files_with_same_mtime(make_app):
+    """Test that a change of the size of a file is detected even if its mtime is unchanged."""
+    app = make_app(
+        {"index.rst": DOUBLE_INCLUDE_RST, "generator.py": 'def generate():\n    return "old"\n'},
+        generate_include_cache_results=True,
+    )
+    app.build()
+
+    generator = app.srcdir / "generator.py"
+    mtime_ns = generator.stat().st_mtime_ns
+    generator.write_text('def generate():\n    return "new value"\n')
+    os.utime(generator, ns=(mtime_ns, mtime_ns))
+    time.sleep(0.01)
+    (app.srcdir / "index.rst").touch()
+    app.build()
+
+    assert app.env.get_doctree("index").astext() == "new value\n\nnew value"
+
+
+def test_result_cache_with_parallel_read(make_app):
+    """Test that results cached by parallel reader processes end up in the environment."""
+    docs = {f"doc{i}.rst": DOUBLE_INCLUDE_RST for i in range(8)}
+    app = make_app(
+        {
+            "index.rst": ".. toctree::\n\n" + "".join(f"   {doc[:-4]}\n" for doc in docs),
+            "generator.py": 'def generate():\n    return "Generated output"\n',
+            **docs,
+        },
+        generate_include_cache_results=True,
+        parallel=2,
+    )
+    app.build()
+
+    assert list(app.env.generate_include_results.values()) == ["Generated output"]
+
+
+def test_sys_path_keeps_existing_file_dir(tmp_python_file, directive, monkeypatch):
+    """Test that a file directory which already is on sys.path stays on it."""
+    file_path = tmp_python_file("""
+        def generate():
+            return "test"
+    """)
+    monkeypatch.syspath_prepend(str(file_path.parent))
+
+    original_path = sys.path.copy()
+    directive._execute_function(file_path, "generate")
+    assert sys.path == original_path
+
+
+@pytest.mark.parametrize(
+    ("comment", "expected_calls"), [("", "x"), ("# generate-include: no-cache", "xx")]
+)
+def test_persistent_cache(make_app, comment, expected_calls):
+    """Test that outputs stored on disk are reused by a clean build unless opted out."""
+    files = {
+        "index.rst": ".. generate-include:: generator.py:generate\n",
+        "generator.py": COUNTING_GENERATOR + f"    {comment}\n",
+    }
+    for _ in range(2):
+        app = make_app(files, generate_include_persistent_cache=True)
+        app.build(force_all=True)
+        assert app.env.get_doctree("index").astext() == "Generated output"
+
+    assert (app.srcdir / "generator.calls").read_text() == expected_calls
+
+
+def test_no_cache_marker_bypasses_all_caches(make_app):
+    """Test that functions of a file opting out of caching are executed for every directive."""
+    app = make_app(
+        {
+            "index.rst": DOUBLE_INCLUDE_RST,
+            "generator.py": COUNTING_GENERATOR + "    # generate-include: no-cache\n",
+        },
+        generate_include_cache_results=True,
+        generate_include_persistent_cache=True,
+    )
+    app.build()
+
+    assert app.env.get_doctree("index").astext() == "Generated output\n\nGenerated output"
+    assert (app.srcdir / "generator.calls").read_text() == "xx"
+
+
+def test_persistent_cache_keyed_by_version(make_app, monkeypatch):
+    """Test that outputs stored on disk by another Python or package version are not reused."""
+    files = {
+        "index.rst": ".. generate-include:: generator.py:generate\n",
+        "generator.py": COUNTING_GENERATOR,
+    }
+    make_app(files, generate_include_persistent_cache=True).build()
+
+    monkeypatch.setattr(generate_include, "_persistent_cache_salt", lambda: b"3.99:0.0.0")
+    app = make_app(files, generate_include_persistent_cache=True)
+    app.build(force_all=True)
+
+    assert app.env.get_doctree("index").astext() == "Generated output"
+    assert (app.srcdir / "generator.calls").read_text() == "xx"
+
+
+def test_source_digests_recorded_on_environment(make_app):
+    """Test that the generator files are recorded with their mtime, size and content hash."""
+    app = make_app(
+        {"index.rst": DOUBLE_INCLUDE_RST, "generator.py": COUNTING_GENERATOR},
+        generate_include_cache_results=True,
+    )
+    app.build()
+
+    generator = app.srcdir / "generator.py"
+    ((path, (mtime_ns, size, digest)),) = app.env.generate_include_sources.items()
+    assert path == str(generator)
+    assert (mtime_ns, size) == (generator.stat().st_mtime_ns, generator.stat().st_size)
+    assert digest == hashlib.blake2b(generator.read_bytes(), digest_size=16).hexdigest()
+
+
+def test_source_digests_not_recorded_without_result_cache(make_app):
+    """Test that generator files are not hashed if the result cache is disabled."""
+    app = make_app({"index.rst": DOUBLE_INCLUDE_RST, "generator.py": COUNTING_GENERATOR})
+    app.build()
+
+    assert app.env.generate_include_sources == {}
+
+
+def test_result_cache_survives_touch(make_app):
+    """Test that cached outputs are reused when only the mtime of a file changed."""
+    app = make_app(
+        {"index.rst": DOUBLE_INCLUDE_RST, "generator.py": COUNTING_GENERATOR},
+        generate_include_cache_results=True,
+    )
+    app.build()
+
+    time.sleep(0.01)
+    (app.srcdir / "generator.py").touch()
+    app.build()
+
+    assert app.env.get_doctree("index").astext() == "Generated output\n\nGenerated output"
+    assert (app.srcdir / "generator.calls").read_text() == "x"
+
+
+def test_module_name_stable_for_unchanged_file(tmp_python_file, directive, bump_mtime):
+    """Test that executions of an unchanged file reuse the same module name."""
+    file_path = tmp_python_file("""
+        def generate():
+            return __name__
+    """)
+
+    name1 = directive._execute_function(file_path, "generate")
+    name2 = directive._execute_function(file_path, "generate")
+    assert name1 == name2
+
+    file_path.write_text("def generate():\n    return __name__ + ' '\n")
+    bump_mtime(file_path)
+    assert directive._execute_function(file_path, "generate") != name1 + " "
+
+
+def test_result_cache_does_not_cache_errors(make_app):
+    """Test that failed executions are retried instead of being cached."""
+    app = make_app(
+        {
+            "index.rst": ".. generate-include:: generator.py:generate\n",
+            "generator.py": """
+                from pathlib import Path
+
+                def generate():
+                    return Path(__file__).with_name("input.txt").read_text()
+            """,
+        },
+        generate_include_cache_results=True,
+    )
+    app.build()
+    assert "Error executing generator.py:generate" in app.warning.getvalue()
+    assert not app.env.generate_include_results
+
+    time.sleep(0.01)
+    (app.srcdir / "input.txt").write_text("Generated output")
+    (app.srcdir / "index.rst").touch()
+    app.build()
+    assert app.env.get_doctree("index").astext() == "Generated output"
+
+
+def test_result_cache_is_bounded(make_app, monkeypatch):
+    """Test that the least recently used outputs are dropped from a full result cache."""
+    monkeypatch.setattr(generate_include, "_RESULT_CACHE_SIZE", 1)
+    app = make_app(
+        {
+            "index.rst": """
+                .. generate-include:: generator.py:first
+
+                .. generate-include:: generator.py:second
+            """,
+            "generator.py": """
+                def first():
+                    return "First"
+
+                def second():
+                    return "Second"
+            """,
+        },
+        generate_include_cache_results=True,
+    )
+    app.build()
+
+    assert list(app.env.generate_include_results.values()) == ["Second"]
@@ -3,11 +3,26 @@
 from __future__ import annotations
 
 import textwrap
-import time
 
 from docutils import nodes
 
-from sphinxcontrib.generate_include.generate_include import GenerateIncludeDirective
+# Sources written by tests that don't use the tmp_python_file fixture
+_WORKS_SRC = textwrap.dedent("""
+    def generate():
+        return "Works!"
+""")
+
+_HELPER_SRC = textwrap.dedent("""
+    def get_message():
+        return "Hello from helper!"
+""")
+
+_GENERATOR_SRC = textwrap.dedent("""
+    from helper import get_message
+
+    def generate():
+        return get_message()
+""")
 
 
 def test_unicode_content(tmp_python_file, directive):
@@ -67,12 +82,7 @@ def test_file_path_with_special_characters(tmp_path, directive):
     special_dir.mkdir()
 
     file_path = special_dir / "my-generator.py"
-    file_path.write_text(
-        textwrap.dedent("""
-        def generate():
-            return "Works!"
-    """)
-    )
+    file_path.write_text(_WORKS_SRC)
 
     result = directive._execute_function(file_path, "generate")
     assert result == "Works!"
@@ -113,33 +123,22 @@ def test_literal_output_type(directive):
 def test_relative_import_in_same_directory(tmp_path, directive):
     """Test that relative imports work for files in the same directory."""
     # Create a helper module
-    (tmp_path / "helper.py").write_text(
-        textwrap.dedent("""
-        def get_message():
-            return "Hello from helper!"
-    """)
-    )
+    (tmp_path / "helper.py").write_text(_HELPER_SRC)
 
     # Create the generator that imports the helper
     generator_file = tmp_path / "generator.py"
-    generator_file.write_text(
-        textwrap.dedent("""
-        from helper import get_message
-
-        def generate():
-            return get_message()
-    """)
-    )
+    generator_file.write_text(_GENERATOR_SRC)
 
     result = directive._execute_function(generator_file, "generate")
 
     assert result == "Hello from helper!"
 
 
-def test_many_rapid_file_changes(tmp_python_file):
+def test_many_rapid_file_changes(tmp_python_file, directive, bump_mtime):
     """Test that rapid file changes are all picked up correctly.
 
-    Uses fresh directive instances to simulate separate sphinx build invocations.
+    Reuses one directive instance, _execute_function keeps no state on it, so every
+    iteration behaves like a separate sphinx build invocation.
     """
     file_path = tmp_python_file("""
         def generate():
@@ -147,12 +146,59 @@ def test_many_rapid_file_changes(tmp_python_file):
     """)
 
     for i in range(1, 6):
-        time.sleep(0.01)  # Ensure mtime changes
         file_path.write_text(f"""
 def generate():
     return "v{i}"
 """)
-        # Use fresh directive for each iteration
-        directive = object.__new__(GenerateIncludeDirective)
+        bump_mtime(file_path)
         result = directive._execute_function(file_path, "generate")
         assert result == f"v{i}"
+
+
+def test_empty_content_creates_no_nodes(make_app):
+    """Test that empty or whitespace-only output adds nothing to the document."""
+    app = make_app(
+        {
+            "index.rst": """
+                Before
+
+                .. generate-include:: generator.py:empty
+
+                .. generate-include:: generator.py:whitespace
+                   :type: rst
+
+                After
+            """,
+            "generator.py": """
+                def empty():
+                    return None
+
+                def whitespace():
+                    return "\\n   \\n"
+            """,
+        }
+    )
+    app.build()
+
+    assert app.env.get_doctree("index").astext() == "Before\n\nAfter"
+
+
+def test_type_hints_in_generator(tmp_python_file, directive):
+    """Test that generators can resolve their own type hints and use dataclasses."""
+    file_path = tmp_python_file("""
+        from __future__ import annotations
+
+        import dataclasses
+        import typing
+
+        @dataclasses.dataclass
+        class Row:
+            name: str
+            values: typing.ClassVar[list[int]] = []
+
+        def generate():
+            return ", ".join(typing.get_type_hints(Row))
+    """)
+
+    result = directive._execute_function(file_path, "generate")
+    assert result == "name, values"
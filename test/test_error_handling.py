@@ -6,7 +6,8 @@ with a syntax error, then fix it and save again.
 
 from __future__ import annotations
 
-import time
+import os
+import textwrap
 
 import pytest
 
@@ -23,28 +24,69 @@ def test_syntax_error_in_source(tmp_python_file, directive):
         directive._execute_function(file_path, "generate")
 
 
-def test_recovery_after_syntax_error(tmp_python_file, directive):
-    """Test that we can recover after a syntax error is fixed."""
-    file_path = tmp_python_file("""
-        def generate(
-            # Syntax error
-            return "test"
-    """)
+@pytest.mark.parametrize(
+    ("bad_source", "exception", "good_source", "expected"),
+    [
+        (
+            """
+            def generate(
+                # Syntax error
+                return "test"
+            """,
+            SyntaxError,
+            """
+            def generate():
+                return "Fixed!"
+            """,
+            "Fixed!",
+        ),
+        (
+            """
+            def generate():
+                raise RuntimeError("Temporary error")
+            """,
+            RuntimeError,
+            """
+            def generate():
+                return "Now it works!"
+            """,
+            "Now it works!",
+        ),
+        (
+            """
+            import nonexistent_module_xyz
+
+            def generate():
+                return "test"
+            """,
+            ModuleNotFoundError,
+            """
+            import os  # Valid import
+
+            def generate():
+                return f"Success! PID: {os.getpid()}"
+            """,
+            f"Success! PID: {os.getpid()}",
+        ),
+    ],
+    ids=["syntax_error", "runtime_error", "import_error"],
+)
+def test_recovery(  # noqa: PLR0913, PLR0917 - fixtures and parameters of the test case
+    tmp_python_file, directive, bump_mtime, bad_source, exception, good_source, expected
+):
+    """Test that we can recover after an error is fixed."""
+    file_path = tmp_python_file(bad_source)
 
     # First call fails
-    with pytest.raises(SyntaxError):
+    with pytest.raises(exception):
         directive._execute_function(file_path, "generate")
 
     # Fix the file
-    time.sleep(0.01)
-    file_path.write_text("""
-def generate():
-    return "Fixed!"
-""")
+    file_path.write_text(textwrap.dedent(good_source))
+    bump_mtime(file_path)
 
     # Second call should succeed
-    result = directive._execute_function(file_path, "generate")
-    assert result == "Fixed!"
+    assert directive._execute_function(file_path, "generate") == expected
 
 
 def test_runtime_error_in_function(tmp_python_file, directive):
@@ -58,29 +100,6 @@ def test_runtime_error_in_function(tmp_python_file, directive):
         directive._execute_function(file_path, "generate")
 
 
-def test_recovery_after_runtime_error(tmp_python_file, directive):
-    """Test recovery after a runtime error is fixed."""
-    file_path = tmp_python_file("""
-        def generate():
-            raise RuntimeError("Temporary error")
-    """)
-
-    # First call fails
-    with pytest.raises(RuntimeError):
-        directive._execute_function(file_path, "generate")
-
-    # Fix the file
-    time.sleep(0.01)
-    file_path.write_text("""
-def generate():
-    return "Now it works!"
-""")
-
-    # Second call should succeed
-    result = directive._execute_function(file_path, "generate")
-    assert result == "Now it works!"
-
-
 def test_import_error_in_source(tmp_python_file, directive):
     """Test handling of import errors in the source file."""
     file_path = tmp_python_file("""
@@ -94,33 +113,6 @@ def test_import_error_in_source(tmp_python_file, directive):
         directive._execute_function(file_path, "generate")
 
 
-def test_recovery_after_import_error(tmp_python_file, directive):
-    """Test recovery after an import error is fixed."""
-    file_path = tmp_python_file("""
-        import nonexistent_module_xyz
-
-        def generate():
-            return "test"
-    """)
-
-    # First call fails
-    with pytest.raises(ModuleNotFoundError):
-        directive._execute_function(file_path, "generate")
-
-    # Fix the file by removing the bad import
-    time.sleep(0.01)
-    file_path.write_text("""
-import os  # Valid import
-
-def generate():
-    return f"Success! PID: {os.getpid()}"
-""")
-
-    # Second call should succeed
-    result = directive._execute_function(file_path, "generate")
-    assert "Success! PID:" in result
-
-
 def test_error_in_module_level_code(tmp_python_file, directive):
     """Test handling of errors in module-level code (not in the function)."""
     file_path = tmp_python_file("""
@@ -135,7 +127,7 @@ def test_error_in_module_level_code(tmp_python_file, directive):
         directive._execute_function(file_path, "generate")
 
 
-def test_alternating_error_and_success(tmp_python_file, directive):
+def test_alternating_error_and_success(tmp_python_file, directive, bump_mtime):
     """Test alternating between error and success states."""
     file_path = tmp_python_file("""
         def generate():
@@ -146,35 +138,43 @@ def test_alternating_error_and_success(tmp_python_file, directive):
     assert directive._execute_function(file_path, "generate") == "success1"
 
     # Introduce error
-    time.sleep(0.01)
     file_path.write_text("""
 def generate():
     raise ValueError("error1")
 """)
+    bump_mtime(file_path)
     with pytest.raises(ValueError, match="error1"):
         directive._execute_function(file_path, "generate")
 
     # Fix
-    time.sleep(0.01)
     file_path.write_text("""
 def generate():
     return "success2"
 """)
+    bump_mtime(file_path)
     assert directive._execute_function(file_path, "generate") == "success2"
 
     # Another error
-    time.sleep(0.01)
     file_path.write_text("""
 def generate():
     raise RuntimeError("error2")
 """)
+    bump_mtime(file_path)
     with pytest.raises(RuntimeError, match="error2"):
         directive._execute_function(file_path, "generate")
 
     # Final fix
-    time.sleep(0.01)
     file_path.write_text("""
 def generate():
     return "success3"
 """)
+    bump_mtime(file_path)
     assert directive._execute_function(file_path, "generate") == "success3"
+
+
+def test_file_not_found(make_app):
+    """Test that a missing file is reported as an error of the directive."""
+    app = make_app({"index.rst": ".. generate-include:: missing.py:generate\n"})
+    app.build()
+
+    assert "File not found: missing.py" in app.warning.getvalue()
@@ -1,17 +1,14 @@
-from pytest_subtests import SubTests
+import enum
+import sys
 
-from sphinxcontrib.generate_include import mdlib
+import pytest
 
+from sphinxcontrib.generate_include import mdlib
 
-def test_table(subtests: SubTests):
-    # Data always stays the same for these tests because formatting does not depend on it
-    table_rows = [
-        ["Alice", "30", "New York"],
-        ["Bob", "25", "Los Angeles"],
-        ["Charlie", "35", "Chicago"],
-    ]
 
-    for headers, expected_headers in [
+@pytest.mark.parametrize(
+    ("headers", "expected_headers"),
+    [
         (
             ["Name", "Age", "City"],
             (
@@ -26,17 +23,25 @@ def test_table(subtests: SubTests):
                 "| :- | :-: | -: |",
             ),
         ),
-    ]:
-        with subtests.test(headers=headers):
-            expected = (
-                f"\n"
-                f"{'\n'.join(expected_headers)}\n"
-                f"| Alice | 30 | New York |\n"
-                f"| Bob | 25 | Los Angeles |\n"
-                f"| Charlie | 35 | Chicago |\n"
-            )
-            result = mdlib.table(headers, table_rows, alignment=["l", "c", "r"])
-            assert result == expected
+    ],
+)
+def test_table(headers, expected_headers):
+    # Data always stays the same for these tests because formatting does not depend on it
+    table_rows = [
+        ["Alice", "30", "New York"],
+        ["Bob", "25", "Los Angeles"],
+        ["Charlie", "35", "Chicago"],
+    ]
+
+    expected = (
+        f"\n"
+        f"{'\n'.join(expected_headers)}\n"
+        f"| Alice | 30 | New York |\n"
+        f"| Bob | 25 | Los Angeles |\n"
+        f"| Charlie | 35 | Chicago |\n"
+    )
+    result = mdlib.table(headers, table_rows, alignment=["l", "c", "r"])
+    assert result == expected
 
 
 def test_ordered_list():
@@ -96,3 +101,36 @@ def test_header():
     assert mdlib.header("Subtitle", level=2) == "## Subtitle"
     assert mdlib.header("Subsubtitle", level=3) == "### Subsubtitle"
     assert mdlib.header("Title", -1) == "# Title"
+
+
+def test_table_without_rows():
+    result = mdlib.table(["Name", "Age"], [], alignment="r")
+    assert result == "\n| Name | Age |\n| ---: | --: |\n"
+
+
+def test_table_converts_cells_to_strings():
+    result = mdlib.table(["Name", "Age"], [["Alice", 30]])
+    assert result == "\n| Name | Age |\n| :--- | :-- |\n| Alice | 30 |\n"
+
+
+def test_table_invalid_alignment():
+    with pytest.raises(ValueError, match="Invalid alignment specifier: x"):
+        mdlib.table(["Name"], [["Alice"]], alignment="x")  # type: ignore[arg-type]
+
+
+def test_deeply_nested_list():
+    depth = sys.getrecursionlimit() + 100
+    items: list = ["Leaf"]
+    for _ in range(depth):
+        items = [items]
+
+    result = mdlib.unordered_list(items)
+    assert result == " " * (2 * depth) + "- Leaf"
+
+
+def test_list_with_str_subclass_items():
+    class Color(enum.StrEnum):
+        RED = "red"
+
+    result = mdlib.unordered_list([Color.RED, [Color.RED]])
+    assert result == "- red\n  - red"
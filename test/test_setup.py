@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from unittest import mock
 
+import pytest
+
 from sphinxcontrib import generate_include
 
 
@@ -18,11 +20,16 @@ class MockSphinx:
         pass
 
 
-def test_setup_returns_metadata():
-    """Test that setup returns proper extension metadata."""
-
+@pytest.fixture(scope="module")
+def setup_result():
+    """Call the setup function once per module with a mocked application."""
     app = mock.Mock()
-    result = generate_include.setup(app)
+    return app, generate_include.setup(app)
+
+
+def test_setup_returns_metadata(setup_result):
+    """Test that setup returns proper extension metadata."""
+    _, result = setup_result
 
     assert isinstance(result, dict)
     assert "version" in result
@@ -30,11 +37,9 @@ def test_setup_returns_metadata():
     assert "parallel_write_safe" in result
 
 
-def test_setup_registers_directive():
+def test_setup_registers_directive(setup_result):
     """Test that setup registers the generate-include directive."""
-
-    app = mock.Mock()
-    generate_include.setup(app)
+    app, _ = setup_result
 
     app.add_directive.assert_called_once_with(
         "generate-include",
@@ -42,20 +47,16 @@ def test_setup_registers_directive():
     )
 
 
-def test_setup_version_is_string():
+def test_setup_version_is_string(setup_result):
     """Test that the version is a valid string."""
-
-    app = mock.Mock()
-    result = generate_include.setup(app)
+    _, result = setup_result
 
     assert result.get("version") == generate_include.__version__
 
 
-def test_parallel_safety_flags():
+def test_parallel_safety_flags(setup_result):
     """Test that parallel safety flags are set correctly."""
-
-    app = mock.Mock()
-    result = generate_include.setup(app)
+    _, result = setup_result
 
     # The directive should be safe for parallel reading and writing
     # since each invocation uses a unique module name